@@ -1,47 +1,218 @@
 from __future__ import annotations
 
+import asyncio
 import os
 import socket
-from datetime import datetime
+import threading
+import time
+from contextlib import asynccontextmanager, suppress
+from itertools import islice
 
-from typing import Dict, List
+from typing import Any, Callable, Coroutine, Dict, Iterable, Iterator, List
 from uuid import UUID
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi import Query, Path
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
 from typing import Optional
+import orjson
+from pydantic import TypeAdapter
 
 from models.health import Health
 from models.product import ProductCreate, ProductRead, ProductUpdate
 from models.company import CompanyCreate, CompanyRead, CompanyUpdate
+from utils import clock
 
 port = int(os.environ.get("FASTAPIPORT", 8000))
 
+# Resolved once at startup (see lifespan): the health endpoints are probed far
+# too often for a per-request lookup, and they only ever read these.
+_HOST_IP = "0.0.0.0"
+
+def make_health_template(ip_address: str) -> bytes:
+    """Health JSON body with %s slots for the timestamp, echo and path_echo (already JSON-encoded)."""
+    return (
+        b'{"status":200,"status_message":"OK","timestamp":"%s","ip_address":'
+        + orjson.dumps(ip_address)
+        + b',"echo":%s,"path_echo":%s}'
+    )
+
+_HEALTH_TEMPLATE = make_health_template(_HOST_IP)
+
+async def resolve_host_ip(timeout: float = 2.0) -> str:
+    """IPv4 address of this host, or 0.0.0.0 if it can't be resolved within ``timeout`` seconds."""
+    loop = asyncio.get_running_loop()
+    try:
+        infos = await asyncio.wait_for(
+            loop.getaddrinfo(socket.gethostname(), None, family=socket.AF_INET), timeout
+        )
+    except (OSError, asyncio.TimeoutError):
+        return "0.0.0.0"
+    return infos[0][4][0] if infos else "0.0.0.0"
+
+def _utc_iso_now() -> str:
+    """Current UTC time as ISO 8601 with millisecond precision and a trailing Z."""
+    t = time.time()
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(t)) + f".{int((t % 1) * 1000):03d}Z"
+
 # -----------------------------------------------------------------------------
 # Fake in-memory "databases"
+# Keyed by UUID.int: int hashing runs in C, UUID.__hash__ is a Python-level call.
+# The API surface still takes and returns UUIDs.
+# -----------------------------------------------------------------------------
+products: Dict[int, ProductRead] = {}
+companies: Dict[int, CompanyRead] = {}
+
+# Sync handlers run in a threadpool, so writes (store + indexes) are serialized
+# per store. Single-record reads stay lock-free; listings hold the lock only
+# while copying one page of ids (see index_lookup).
+products_lock = threading.Lock()
+companies_lock = threading.Lock()
+
+# Update models make every field Optional, but PATCH must not null out a field
+# the Read model requires: the stored record is never re-validated.
+PRODUCT_REQUIRED_FIELDS = frozenset(f for f, info in ProductRead.model_fields.items() if info.is_required())
+COMPANY_REQUIRED_FIELDS = frozenset(f for f, info in CompanyRead.model_fields.items() if info.is_required())
+
+def reject_null_required(update, required: frozenset) -> None:
+    nulls = sorted(f for f in update.model_fields_set & required if getattr(update, f) is None)
+    if nulls:
+        # Same error shape as FastAPI's own body validation failures
+        raise RequestValidationError([
+            {"type": "null_not_allowed", "loc": ("body", field), "msg": "Field may not be null", "input": None}
+            for field in nulls
+        ])
+
+# Built once so list responses serialize straight to JSON bytes in pydantic-core.
+# Iterable (not List) lets them consume a lazy result without building a list first.
+PRODUCT_LIST_ADAPTER = TypeAdapter(Iterable[ProductRead])
+COMPANY_LIST_ADAPTER = TypeAdapter(Iterable[CompanyRead])
+
+# -----------------------------------------------------------------------------
+# Secondary indexes: field -> value -> ids, so exact-match filters skip the
+# full scan. Buckets are dicts used as insertion-ordered sets. A filtered
+# listing walks the bucket of the first filtered field in the index's field
+# order, so it is ordered by when records took on that value: new records and
+# unrelated writes only append, and never shift earlier pages.
+# -----------------------------------------------------------------------------
+Index = Dict[str, Dict[Any, Dict[int, None]]]
+
+product_index: Index = {
+    "name": {}, "description": {}, "price": {}, "quantity": {},
+}
+company_index: Index = {
+    "name": {}, "industry": {}, "employees": {}, "phone": {}, "state": {},
+}
+
+def index_add(index: Index, obj) -> None:
+    key = obj.id.int
+    for field, buckets in index.items():
+        buckets.setdefault(getattr(obj, field), {})[key] = None
+
+def index_remove(index: Index, obj) -> None:
+    key = obj.id.int
+    for field, buckets in index.items():
+        value = getattr(obj, field)
+        bucket = buckets[value]
+        del bucket[key]
+        if not bucket:
+            del buckets[value]
+
+def index_move(index: Index, obj, changes: Dict[str, Any]) -> None:
+    """Re-bucket ``obj`` for the changed fields only; call before applying ``changes``."""
+    key = obj.id.int
+    for field, value in changes.items():
+        buckets = index.get(field)
+        if buckets is None:
+            continue
+        old = getattr(obj, field)
+        bucket = buckets[old]
+        del bucket[key]
+        if not bucket:
+            del buckets[old]
+        buckets.setdefault(value, {})[key] = None
+
+def index_lookup(
+    store: Dict[int, Any], index: Index, lock: threading.Lock,
+    filters: Dict[str, Any], offset: int, limit: int,
+) -> Iterator[Any]:
+    # Dict iterators break if a writer resizes the dict while they are live, so
+    # hold the write lock just while the page (at most ``limit`` ids) is copied.
+    # Serialization happens afterwards, outside the lock.
+    # Fixed field priority (not bucket size), so the order doesn't change as buckets grow
+    active = [(field, filters[field]) for field in index if filters.get(field) is not None]
+    with lock:
+        if not active:
+            return iter(tuple(islice(store.values(), offset, offset + limit)))
+        # Walk the first filtered field's bucket and probe the others
+        buckets = [index[field].get(value, {}) for field, value in active]
+        ids: Iterator[int] = iter(buckets[0])
+        for bucket in buckets[1:]:
+            ids = filter(bucket.__contains__, ids)
+        page = tuple(islice(ids, offset, offset + limit))
+    # A concurrent PATCH may have changed a record after the snapshot, so re-check it
+    return (
+        obj for obj in map(store.get, page)
+        if obj is not None and all(getattr(obj, field) == value for field, value in active)
+    )
+
+# -----------------------------------------------------------------------------
+# orjson request parsing
 # -----------------------------------------------------------------------------
-products: Dict[UUID, ProductRead] = {}
-companies: Dict[UUID, CompanyRead] = {}
+class ORJSONRequest(Request):
+    """Request whose JSON body is decoded with orjson instead of the stdlib json module."""
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError, so FastAPI still
+            # turns malformed bodies into a 422
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+class ORJSONRoute(APIRoute):
+    """Route that hands its endpoint an ORJSONRequest."""
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        original_route_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            return await original_route_handler(ORJSONRequest(request.scope, request.receive))
+
+        return route_handler
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _HOST_IP, _HEALTH_TEMPLATE
+    _HOST_IP = await resolve_host_ip()
+    _HEALTH_TEMPLATE = make_health_template(_HOST_IP)
+    # Build (and cache) the OpenAPI schema before taking traffic, not on the first /docs hit
+    app.openapi()
+    # Stored timestamps read a cached clock instead of reading the system clock per write
+    ticker = asyncio.create_task(clock.tick())
+    yield
+    ticker.cancel()
+    with suppress(asyncio.CancelledError):
+        await ticker
 
 app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     title="Product/Company API",
     description="Demo FastAPI app using Pydantic v2 models for Product and Company",
     version="0.1.0",
 )
+# Must be set before any routes are registered
+app.router.route_class = ORJSONRoute
 
 # -----------------------------------------------------------------------------
 # Health endpoints
 # -----------------------------------------------------------------------------
 
-def make_health(echo: Optional[str], path_echo: Optional[str]=None) -> Health:
-    return Health(
-        status=200,
-        status_message="OK",
-        timestamp=datetime.utcnow().isoformat() + "Z",
-        ip_address=socket.gethostbyname(socket.gethostname()),
-        echo=echo,
-        path_echo=path_echo
-    )
+def make_health(echo: Optional[str], path_echo: Optional[str]=None) -> Response:
+    # Only the timestamp and echoes vary, so fill them into the prebuilt body
+    # instead of building and serializing a Health model on every probe
+    body = _HEALTH_TEMPLATE % (_utc_iso_now().encode(), orjson.dumps(echo), orjson.dumps(path_echo))
+    return Response(content=body, media_type="application/json")
 
 @app.get("/health", response_model=Health)
 def get_health_no_path(echo: str | None = Query(None, description="Optional echo string")):
@@ -61,51 +232,64 @@ def get_health_with_path(
 # -----------------------------------------------------------------------------
 @app.post("/product", response_model=ProductCreate, status_code=201)
 def create_product(product: ProductCreate):
-    if product.id in products:
-        raise HTTPException(status_code=400, detail="Product with this ID already exists")
-    products[product.id] = ProductRead(**product.model_dump())
-    return products[product.id]
+    key = product.id.int
+    # The payload was validated as ProductCreate, so skip re-validating it
+    now = clock.utcnow()
+    stored = ProductRead.model_construct(**product.model_dump(), created_at=now, updated_at=now)
+    with products_lock:
+        if key in products:
+            raise HTTPException(status_code=400, detail="Product with this ID already exists")
+        products[key] = stored
+        index_add(product_index, stored)
+    return stored
 
 @app.get("/product", response_model=List[ProductRead])
 def list_products(
     name: Optional[str] = Query(None, description="Filter by name."),
     description: Optional[str] = Query(None, description="Filter by product description."),
     price: Optional[float] = Query(None, description="Filter by price of item in USD."),
-    quantity: Optional[int] = Query(None, description="Filter by quantity of item in stock.")
+    quantity: Optional[int] = Query(None, description="Filter by quantity of item in stock."),
+    limit: int = Query(100, ge=1, le=10000, description="Maximum number of products to return."),
+    offset: int = Query(0, ge=0, description="Number of matching products to skip."),
 ):
-    results = list(products.values())
-
-    if name is not None:
-        results = [a for a in results if a.name == name]
-    if description is not None:
-        results = [a for a in results if a.description == description]
-    if price is not None:
-        results = [a for a in results if a.price == price]
-    if quantity is not None:
-        results = [a for a in results if a.quantity == quantity]
+    results = index_lookup(products, product_index, products_lock, {
+        "name": name, "description": description, "price": price, "quantity": quantity,
+    }, offset, limit)
 
-    return results
+    return Response(content=PRODUCT_LIST_ADAPTER.dump_json(results), media_type="application/json")
 
 @app.get("/products/{product_id}", response_model=ProductRead)
 def get_products(product_id: UUID):
-    if product_id not in products:
+    stored = products.get(product_id.int)
+    if stored is None:
         raise HTTPException(status_code=404, detail="Product not found")
-    return products[product_id]
+    return ORJSONResponse(stored.model_dump())
 
 @app.patch("/products/{product_id}", response_model=ProductRead)
 def update_product(product_id: UUID, update: ProductUpdate):
-    if product_id not in products:
-        raise HTTPException(status_code=404, detail="Product not found")
-    stored = products[product_id].model_dump()
-    stored.update(update.model_dump(exclude_unset=True))
-    products[product_id] = ProductRead(**stored)
-    return products[product_id]
+    with products_lock:
+        stored = products.get(product_id.int)
+        if stored is None:
+            raise HTTPException(status_code=404, detail="Product not found")
+        reject_null_required(update, PRODUCT_REQUIRED_FIELDS)
+        changes = {
+            field: getattr(update, field) for field in update.model_fields_set
+            if getattr(update, field) != getattr(stored, field)
+        }
+        # Only changed fields move buckets, so unchanged ones keep their list position
+        index_move(product_index, stored, changes)
+        # The stored record is already validated, so patch it in place instead of rebuilding
+        # it. Swap the whole __dict__ in one step so lock-free readers never see half a PATCH.
+        object.__setattr__(stored, "__dict__", {**stored.__dict__, **changes, "updated_at": clock.utcnow()})
+    return stored
 
 @app.delete("/products/{product_id}", status_code=204)
 def delete_product(product_id: UUID):
-    if product_id not in products:
-        raise HTTPException(status_code=404, detail="Product not found.")
-    del products[product_id]
+    with products_lock:
+        stored = products.pop(product_id.int, None)
+        if stored is None:
+            raise HTTPException(status_code=404, detail="Product not found.")
+        index_remove(product_index, stored)
 
 
 # -----------------------------------------------------------------------------
@@ -113,10 +297,16 @@ def delete_product(product_id: UUID):
 # -----------------------------------------------------------------------------
 @app.post("/company", response_model=CompanyCreate, status_code=201)
 def create_company(company: CompanyCreate):
-    if company.id in companies:
-        raise HTTPException(status_code=400, detail="Company with this ID already exists")
-    companies[company.id] = CompanyRead(**company.model_dump())
-    return companies[company.id]
+    key = company.id.int
+    # The payload was validated as CompanyCreate, so skip re-validating it
+    now = clock.utcnow()
+    stored = CompanyRead.model_construct(**company.model_dump(), created_at=now, updated_at=now)
+    with companies_lock:
+        if key in companies:
+            raise HTTPException(status_code=400, detail="Company with this ID already exists")
+        companies[key] = stored
+        index_add(company_index, stored)
+    return stored
 
 @app.get("/company", response_model=List[CompanyRead])
 def list_companies(
@@ -124,43 +314,48 @@ def list_companies(
     industry: Optional[str] = Query(None, description="Filter by industry."),
     employees: Optional[int] = Query(None, description="Filter by number of employees."),
     phone: Optional[str] = Query(None, description="Filter by phone number."),
-    state: Optional[str] = Query(None, description="Filter by company home state.")
+    state: Optional[str] = Query(None, description="Filter by company home state."),
+    limit: int = Query(100, ge=1, le=10000, description="Maximum number of companies to return."),
+    offset: int = Query(0, ge=0, description="Number of matching companies to skip."),
 ):
-    results = list(companies.values())
-
-    if name is not None:
-        results = [a for a in results if a.name == name]
-    if industry is not None:
-        results = [a for a in results if a.industry == industry]
-    if employees is not None:
-        results = [a for a in results if a.employees == employees]
-    if phone is not None:
-        results = [a for a in results if a.phone == phone]
-    if state is not None:
-        results = [a for a in results if a.state == state]
+    results = index_lookup(companies, company_index, companies_lock, {
+        "name": name, "industry": industry, "employees": employees, "phone": phone, "state": state,
+    }, offset, limit)
 
-    return results
+    return Response(content=COMPANY_LIST_ADAPTER.dump_json(results), media_type="application/json")
 
 @app.get("/companies/{company_id}", response_model=CompanyRead)
 def get_companies(company_id: UUID):
-    if company_id not in companies:
+    stored = companies.get(company_id.int)
+    if stored is None:
         raise HTTPException(status_code=404, detail="Company not found")
-    return companies[company_id]
+    return ORJSONResponse(stored.model_dump())
 
 @app.patch("/companies/{company_id}", response_model=CompanyRead)
 def update_company(company_id: UUID, update: CompanyUpdate):
-    if company_id not in companies:
-        raise HTTPException(status_code=404, detail="Company not found")
-    stored = companies[company_id].model_dump()
-    stored.update(update.model_dump(exclude_unset=True))
-    companies[company_id] = CompanyUpdate(**stored)
-    return companies[company_id]
+    with companies_lock:
+        stored = companies.get(company_id.int)
+        if stored is None:
+            raise HTTPException(status_code=404, detail="Company not found")
+        reject_null_required(update, COMPANY_REQUIRED_FIELDS)
+        changes = {
+            field: getattr(update, field) for field in update.model_fields_set
+            if getattr(update, field) != getattr(stored, field)
+        }
+        # Only changed fields move buckets, so unchanged ones keep their list position
+        index_move(company_index, stored, changes)
+        # The stored record is already validated, so patch it in place instead of rebuilding
+        # it. Swap the whole __dict__ in one step so lock-free readers never see half a PATCH.
+        object.__setattr__(stored, "__dict__", {**stored.__dict__, **changes, "updated_at": clock.utcnow()})
+    return stored
 
 @app.delete("/companies/{company_id}", status_code=204)
 def delete_company(company_id: UUID):
-    if company_id not in companies:
-        raise HTTPException(status_code=404, detail="Company not found")
-    del companies[company_id]
+    with companies_lock:
+        stored = companies.pop(company_id.int, None)
+        if stored is None:
+            raise HTTPException(status_code=404, detail="Company not found")
+        index_remove(company_index, stored)
 
 # -----------------------------------------------------------------------------
 # Root
@@ -5,6 +5,17 @@ from uuid import UUID, uuid4
 from datetime import datetime
 from pydantic import BaseModel, Field
 
+from utils.clock import utcnow
+
+# Shared example payload, referenced by several models' schema config
+_COMPANY_EXAMPLE = {
+    "id": "550e8400-e29b-41d4-a716-446655440000",
+    "name": "Major Company Inc.",
+    "industry": "Aerospace",
+    "employees": 400,
+    "phone": "555-555-5555",
+    "state": "New York",
+}
 
 
 class CompanyBase(BaseModel):
@@ -41,18 +52,7 @@ class CompanyBase(BaseModel):
     )
 
     model_config = {
-        "json_schema_extra": {
-            "examples": [
-                {
-                    "id": "550e8400-e29b-41d4-a716-446655440000",
-                    "name": "Major Company Inc.",
-                    "industry": "Aerospace",
-                    "employees": 400,
-                    "phone": "555-555-5555",
-                    "state": "New York"
-                }
-            ]
-        }
+        "json_schema_extra": {"examples": [_COMPANY_EXAMPLE]},
     }
 
 class CompanyCreate(CompanyBase):
@@ -103,14 +103,7 @@ class CompanyUpdate(BaseModel):
     model_config = {
         "json_schema_extra": {
             "examples": [
-                {
-                    "id": "550e8400-e29b-41d4-a716-446655440000",
-                    "name": "Major Company Inc.",
-                    "industry": "Aerospace",
-                    "employees": 400,
-                    "phone": "555-555-5555",
-                    "state": "New York"
-                },
+                _COMPANY_EXAMPLE,
                 {"employees": 450},
             ]
         }
@@ -118,12 +111,12 @@ class CompanyUpdate(BaseModel):
 
 class CompanyRead(CompanyBase):
     created_at: datetime = Field(
-        default_factory=datetime.utcnow,
+        default_factory=utcnow,
         description="Creation timestamp (UTC).",
         json_schema_extra={"example": "2025-01-15T10:20:30Z"},
     )
     updated_at: datetime = Field(
-        default_factory=datetime.utcnow,
+        default_factory=utcnow,
         description="Last update timestamp (UTC).",
         json_schema_extra={"example": "2025-01-16T12:00:00Z"},
     )
@@ -131,12 +124,7 @@ class CompanyRead(CompanyBase):
         "json_schema_extra": {
             "examples": [
                 {
-                    "id": "550e8400-e29b-41d4-a716-446655440000",
-                    "name": "Major Company Inc.",
-                    "industry": "Aerospace",
-                    "employees": 400,
-                    "phone": "555-555-5555",
-                    "state": "New York",
+                    **_COMPANY_EXAMPLE,
                     "created_at": "2025-01-15T10:20:30Z",
                     "updated_at": "2025-01-16T12:00:00Z",
                 }
@@ -5,6 +5,16 @@ from uuid import UUID, uuid4
 from datetime import datetime
 from pydantic import BaseModel, Field
 
+from utils.clock import utcnow
+
+# Shared example payload, referenced by several models' schema config
+_PRODUCT_EXAMPLE = {
+    "id": "550e8400-e29b-41d4-a716-446655440000",
+    "name": "Toaster",
+    "description": "A kitchen appliance used to toast bread.",
+    "price": 24.99,
+    "quantity": 35,
+}
 
 class ProductBase(BaseModel):
     """Base model for a product to be used in an inventory system, for example"""
@@ -34,17 +44,7 @@ class ProductBase(BaseModel):
         json_schema_extra={"example": 35}
     )
     model_config = {
-        "json_schema_extra": {
-            "examples": [
-                {
-                    "id": "550e8400-e29b-41d4-a716-446655440000",
-                    "name": "Toaster",
-                    "description": "A kitchen appliance used to toast bread.",
-                    "price": 24.99,
-                    "quantity": 35
-                }
-            ]
-        }
+        "json_schema_extra": {"examples": [_PRODUCT_EXAMPLE]},
     }
     
 class ProductCreate(ProductBase):
@@ -101,12 +101,12 @@ class ProductUpdate(BaseModel):
 class ProductRead(ProductBase):
     """Read the product and get updated and created at times."""
     created_at: datetime = Field(
-        default_factory=datetime.utcnow,
+        default_factory=utcnow,
         description="Creation timestamp (UTC).",
         json_schema_extra={"example": "2025-09-10T14:19:00Z"},
     )
     updated_at: datetime = Field(
-        default_factory=datetime.utcnow,
+        default_factory=utcnow,
         description="Last update timestamp (UTC).",
         json_schema_extra={"example": "2025-09-14T01:00:00Z"},
     )
@@ -114,11 +114,7 @@ class ProductRead(ProductBase):
         "json_schema_extra": {
             "examples": [
                 {
-                    "id": "550e8400-e29b-41d4-a716-446655440000",
-                    "name": "Toaster",
-                    "description": "A kitchen appliance used to toast bread.",
-                    "price": 24.99,
-                    "quantity": 35,
+                    **_PRODUCT_EXAMPLE,
                     "created_at": "2025-09-10T14:19:00Z",
                     "updated_at": "2025-09-14T01:00:00Z",
                 }
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional
+
+TICK_SECONDS = 0.1
+
+# Refreshed by tick(); None whenever no ticker is running
+_now: Optional[datetime] = None
+
+
+def utcnow() -> datetime:
+    """Current UTC time (naive), at most TICK_SECONDS stale while tick() runs.
+
+    Falls back to reading the system clock when no ticker is running, so
+    callers outside the app lifespan never see a frozen clock.
+    """
+    now = _now
+    return now if now is not None else _system_utcnow()
+
+
+def _system_utcnow() -> datetime:
+    # Naive UTC like the deprecated datetime.utcnow(), without its warning
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def tick(interval: float = TICK_SECONDS) -> None:
+    """Refresh the cached time every ``interval`` seconds until cancelled."""
+    global _now
+    try:
+        while True:
+            _now = _system_utcnow()
+            await asyncio.sleep(interval)
+    finally:
+        _now = None